@@ -1,23 +1,32 @@
 import typer
 from typing_extensions import Annotated
 
-from typing import List
-from langchain_core.documents import Document
-from markdownify import markdownify
+from typing import TYPE_CHECKING
 from rich import print
-import uuid
+import asyncio
+import logging
 import os
 
+# The langchain, pymilvus and utils imports are heavy, so they are only done inside the commands
+# that need them, keeping --help and argument errors fast.
+if TYPE_CHECKING:
+    from pymilvus import MilvusClient
 
-from langchain_ollama.embeddings import OllamaEmbeddings
-from langchain_openai.embeddings import OpenAIEmbeddings
-from pymilvus import MilvusClient
+app = typer.Typer()
 
-from .utils.summarizer import endpoint_summary_chain
-from .utils.milvus_db import seutp_milvus_vectorstore, ingest_swagger
-from .utils.swagger import get_swagger, resolve_swagger
+DEFAULT_DB_NAME = "swagger_db"
+
+
+def _use_or_create_database(client: "MilvusClient", db_name: str):
+    """
+    Switches the Milvus client to the given database, creating it first if it does not exist.
+    """
+    existing_dbs = set(client.list_databases())
+    if db_name not in existing_dbs:
+        print(f"'{db_name}' not found, creating a new one.")
+        client.create_database(db_name=db_name)
+    client.use_database(db_name=db_name)
 
-app = typer.Typer()
 
 @app.command()
 def create_database(
@@ -33,7 +42,23 @@ def create_database(
     This command fetches the OpenAPI specification from the provided Swagger URL,
     resolves any references, and ingests the specification into a Milvus vector database.
     """
+    from langchain_ollama.embeddings import OllamaEmbeddings
+    from langchain_openai.embeddings import OpenAIEmbeddings
+    from pymilvus import MilvusClient
+
+    from .utils.summarizer import get_endpoint_summary_chain
+    from .utils.milvus_db import seutp_milvus_vectorstore, aingest_swagger
+    from .utils.swagger import resolve_swagger
+    from rich.logging import RichHandler
+
+    # Show the progress logged by the package, leaving the logging of the libraries untouched
+    package_logger = logging.getLogger("milvus_swagger")
+    package_logger.setLevel(logging.INFO)
+    package_logger.addHandler(RichHandler(show_path=False))
  
+    # Build the summary chain first, so a missing OpenAI API key fails before any other work is done
+    endpoint_summary_chain = get_endpoint_summary_chain()
+
     milvus_db_name = db_name
     # Setup Milvus vectorstore
     if not milvus_uri:
@@ -48,21 +73,11 @@ def create_database(
         raise ValueError(f"Failed to connect to Milvus: {e}")
     
 
-    if milvus_db_name:
-        if milvus_db_name in client.list_databases():
-            client.use_database(milvus_db_name)
-        else:
-            client.create_database(db_name=milvus_db_name)
-            client.use_database(db_name=milvus_db_name)
-    else:
-        print("No database name provided, using default 'swagger_db'.")
-        if "swagger_db" in client.list_databases():
-            client.use_database(db_name="swagger_db")
-        else:
-            print("'swagger_db' not found, creating a new one.")
-            client.create_database(db_name="swagger_db")
-            client.use_database(db_name="swagger_db")
-            milvus_db_name = "swagger_db"
+    if not milvus_db_name:
+        print(f"No database name provided, using default '{DEFAULT_DB_NAME}'.")
+        milvus_db_name = DEFAULT_DB_NAME
+
+    _use_or_create_database(client, milvus_db_name)
 
     
 
@@ -117,12 +132,12 @@ def create_database(
                 ingestion_kwargs["checkpoint_file"] = resume_from_checkpoint_file
         
         # If no checkpoint file is provided, check if the default checkpoint file exists
-        if not resume_from_checkpoint_file and os.path.exists("swagger_ingestion_progress.json"):
+        if not resume_from_checkpoint_file and os.path.exists("swagger_ingestion_progress.jsonl"):
             resume = typer.confirm("Checkpoint file found. Do you want to resume from it?", default=True)
             if resume:
                 print("Resuming from checkpoint file.")
                 ingestion_kwargs["resume"] = True
-                # Default file name is kept as "swagger_ingestion_progress.json" in the ingest_swagger function
+                # Default file name is kept as "swagger_ingestion_progress.jsonl" in the ingest_swagger function
 
             else:
                 print("Starting fresh ingestion.")
@@ -133,12 +148,12 @@ def create_database(
             ingestion_kwargs["resume"] = False
 
         # Ingest the swagger spec into Milvus
-        documents = ingest_swagger(
+        documents = asyncio.run(aingest_swagger(
             swagger_spec=swagger_dict,
             milvus_vectorstore=milvus_vectorstore,
             endpoint_summary_chain=endpoint_summary_chain,
             **ingestion_kwargs,
-        )
+        ))
     
     except Exception as e:
         print(f"Error during ingestion: {e}")
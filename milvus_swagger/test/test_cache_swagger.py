@@ -3,7 +3,8 @@ import os
 import json
 import shutil
 
-from ..utils.swagger import cache_swagger
+from ..utils import swagger
+from ..utils.swagger import cache_swagger, check_against_cache, HASH_SIDECAR_SUFFIX, OPERATION_HASHES_SUFFIX
 
 def test_creates_custom_cache_dir_if_does_not_exist():
     """
@@ -106,4 +107,115 @@ def test_cache_file_contains_swagger_spec(tmp_path):
     assert cached_spec == swagger_spec_dict
 
     # Cleanup
-    shutil.rmtree(tmp_path)
\ No newline at end of file
+    shutil.rmtree(tmp_path)
+
+
+def test_creates_hash_sidecar_file(tmp_path):
+    """
+    Test that the digest sidecar file is created next to the cache file.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {}
+    }
+
+    # Act
+    cache_file = cache_swagger(swagger_spec_dict, tmp_path)
+
+    # Assert
+    assert os.path.exists(cache_file + HASH_SIDECAR_SUFFIX)
+
+
+def test_overwrites_cache_without_leaving_temporary_files(tmp_path):
+    """
+    Test that caching a spec again replaces the cached files and leaves no temporary file behind.
+    """
+    # Arrange
+    cache_swagger({"swagger": "2.0", "paths": {}}, tmp_path)
+    swagger_spec_dict = {
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "2.0"
+        },
+        "paths": {}
+    }
+
+    # Act
+    cache_file = cache_swagger(swagger_spec_dict, tmp_path)
+
+    # Assert
+    with open(cache_file, 'r') as f:
+        cached_spec = json.load(f)
+
+    assert cached_spec == swagger_spec_dict
+    assert sorted(os.listdir(tmp_path)) == sorted([
+        "swagger_cache.json",
+        "swagger_cache.json" + HASH_SIDECAR_SUFFIX,
+        "swagger_cache" + OPERATION_HASHES_SUFFIX,
+    ])
+
+
+def test_creates_operation_hashes_file(tmp_path):
+    """
+    Test that the digests of the operations are stored next to the cache file.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest"
+                }
+            }
+        }
+    }
+
+    # Act
+    cache_swagger(swagger_spec_dict, tmp_path)
+
+    # Assert
+    with open(os.path.join(tmp_path, "swagger_cache" + OPERATION_HASHES_SUFFIX), 'r') as f:
+        operation_hashes = json.load(f)
+
+    assert [entry[:3] for entry in operation_hashes] == [["/test", "get", "getTest"]]
+
+
+@pytest.mark.parametrize("interrupted_suffix", [HASH_SIDECAR_SUFFIX, OPERATION_HASHES_SUFFIX])
+def test_interrupted_cache_update_does_not_match_previous_spec(tmp_path, monkeypatch, interrupted_suffix):
+    """
+    Test that when caching a new spec stops after the spec is written, the previous spec no longer matches the cache.
+    """
+    # Arrange
+    previous_spec_dict = {"swagger": "2.0", "paths": {"/test": {"get": {"operationId": "getTest"}}}}
+    new_spec_dict = {"swagger": "2.0", "paths": {"/test": {"get": {"operationId": "getTest", "description": "New"}}}}
+    cache_swagger(previous_spec_dict, tmp_path)
+
+    atomic_write = swagger._atomic_write
+
+    def interrupted_atomic_write(file_path, data):
+        if str(file_path).endswith(interrupted_suffix):
+            raise OSError("interrupted")
+        atomic_write(file_path, data)
+
+    monkeypatch.setattr(swagger, "_atomic_write", interrupted_atomic_write)
+
+    # Act
+    with pytest.raises(OSError):
+        cache_swagger(new_spec_dict, tmp_path)
+
+    # Assert
+    cache_file = os.path.join(tmp_path, "swagger_cache.json")
+    with open(cache_file, 'r') as f:
+        assert json.load(f) == new_spec_dict
+    assert check_against_cache(previous_spec_dict, cache_file) == False
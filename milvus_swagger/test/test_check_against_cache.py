@@ -1,7 +1,7 @@
 import pytest
 import json
 
-from ..utils.swagger import check_against_cache
+from ..utils.swagger import check_against_cache, cache_swagger
 
 @pytest.fixture
 def create_cache_dir(tmp_path):
@@ -89,4 +89,56 @@ def test_cache_file_not_found(create_cache_dir):
     # Call the function and assert that it raises a ValueError
     with pytest.raises(ValueError) as excinfo:
         check_against_cache(swagger_spec_dict, cached_spec_path)
-    assert str(excinfo.value) == f"Cached spec file not found at {cached_spec_path}"    
\ No newline at end of file
+    assert str(excinfo.value) == f"Cached spec file not found at {cached_spec_path}"
+
+
+
+def test_matching_hash_sidecar_skips_loading_cache(create_cache_dir):
+    """
+    Test that the function returns True from the digest sidecar without loading the cached spec.
+    """
+
+    swagger_spec_dict = {
+        "paths": {
+            "/api/v1/resource": {
+                "get": {
+                    "operationId": "getResource"
+                }
+            }
+        }
+    }
+    cached_spec_path = cache_swagger(swagger_spec_dict, create_cache_dir)
+
+    # Corrupt the cached spec, it should never be parsed
+    with open(cached_spec_path, 'w') as f:
+        f.write("not json")
+
+    result = check_against_cache(swagger_spec_dict, cached_spec_path)
+
+    assert result == True
+
+
+
+def test_non_matching_hash_sidecar_skips_loading_cache(create_cache_dir):
+    """
+    Test that the function returns False from the digest sidecar without loading the cached spec.
+    """
+
+    swagger_spec_dict = {
+        "paths": {
+            "/api/v1/resource": {
+                "get": {
+                    "operationId": "getResource"
+                }
+            }
+        }
+    }
+    cached_spec_path = cache_swagger({"paths": {}}, create_cache_dir)
+
+    # Corrupt the cached spec, it should never be parsed
+    with open(cached_spec_path, 'w') as f:
+        f.write("not json")
+
+    result = check_against_cache(swagger_spec_dict, cached_spec_path)
+
+    assert result == False
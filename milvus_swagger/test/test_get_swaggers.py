@@ -0,0 +1,29 @@
+import pytest
+
+from ..utils import swagger
+from ..utils.swagger import get_swaggers
+
+
+def test_returns_specs_in_url_order(monkeypatch):
+    """
+    Test that the specs are returned in the same order as the URLs, with None for failed fetches.
+    """
+    specs = {
+        "http://localhost/a.json": {"swagger": "2.0", "info": {"title": "A"}},
+        "http://localhost/b.json": None,
+        "http://localhost/c.json": {"swagger": "2.0", "info": {"title": "C"}},
+    }
+    monkeypatch.setattr(swagger, "get_swagger", lambda url: specs[url])
+
+    # Act
+    result = get_swaggers(list(specs))
+
+    # Assert
+    assert result == list(specs.values())
+
+
+def test_returns_empty_list_for_no_urls():
+    """
+    Test that no request is made and an empty list is returned when there are no URLs.
+    """
+    assert get_swaggers([]) == []
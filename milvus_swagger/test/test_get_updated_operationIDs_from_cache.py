@@ -1,6 +1,8 @@
 import pytest
 import json
-from ..utils.swagger import get_updated_operationIDs_from_cache
+import os
+from ..utils import swagger
+from ..utils.swagger import get_updated_operationIDs_from_cache, cache_swagger, HASH_SIDECAR_SUFFIX, OPERATION_HASHES_SUFFIX
 
 
 # Test cases for identifying updated operations between swagger specs and cached specs
@@ -81,6 +83,82 @@ swagger_spec_test_data = [
         "paths": {}
     }, {}, []),
 
+    # Test case 4: Operation removed from the cached spec
+    ({
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "description": "Get method"
+                }
+            }
+        }
+    }, {
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "description": "Get method"
+                },
+                "delete": {
+                    "operationId": "deleteTest",
+                    "description": "Delete method"
+                }
+            }
+        }
+    }, ["deleteTest"]),
+
+    # Test case 5: Operation moved to another path, and operation renamed on the same path
+    ({
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {
+            "/tests": {
+                "get": {
+                    "operationId": "getTest",
+                    "description": "Get method"
+                },
+                "post": {
+                    "operationId": "addTest",
+                    "description": "Create method"
+                }
+            }
+        }
+    }, {
+        "swagger": "2.0",
+        "info": {
+            "title": "Test API",
+            "version": "1.0"
+        },
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "description": "Get method"
+                }
+            },
+            "/tests": {
+                "post": {
+                    "operationId": "createTest",
+                    "description": "Create method"
+                }
+            }
+        }
+    }, ["getTest", "addTest", "createTest"]),
+
 ]
 
 @pytest.mark.parametrize("swagger_spec_dict, cached_spec_dict, expected_operation_ids", swagger_spec_test_data)
@@ -99,3 +177,68 @@ def test_get_updated_operationIDs_from_cache(swagger_spec_dict, cached_spec_dict
 
     # Assert
     assert updated_operation_ids == expected_operation_ids
+
+
+@pytest.mark.parametrize("swagger_spec_dict, cached_spec_dict, expected_operation_ids", swagger_spec_test_data)
+def test_get_updated_operationIDs_from_cache_operation_hashes(swagger_spec_dict, cached_spec_dict, expected_operation_ids, tmp_path):
+    """
+    Test that the operation digests written by cache_swagger give the same result, without loading the cached spec.
+    """
+    cached_spec_path = cache_swagger(cached_spec_dict, tmp_path)
+
+    # Corrupt the cached spec, it should never be parsed
+    with open(cached_spec_path, 'w') as f:
+        f.write("not json")
+
+    # Act
+    updated_operation_ids = get_updated_operationIDs_from_cache(swagger_spec_dict, cached_spec_path)
+
+    # Assert
+    assert updated_operation_ids == expected_operation_ids
+
+
+def test_unchanged_spec_skips_operation_comparison(tmp_path):
+    """
+    Test that an unchanged spec is recognised from the digest sidecar alone, without reading any operation.
+    """
+    swagger_spec_dict = swagger_spec_test_data[0][0]
+    cached_spec_path = cache_swagger(swagger_spec_dict, tmp_path)
+
+    # Corrupt the cached spec and the operation digests, they should never be parsed
+    for file_name in os.listdir(tmp_path):
+        if not file_name.endswith(HASH_SIDECAR_SUFFIX):
+            with open(tmp_path / file_name, 'w') as f:
+                f.write("not json")
+
+    # Act
+    updated_operation_ids = get_updated_operationIDs_from_cache(swagger_spec_dict, cached_spec_path)
+
+    # Assert
+    assert updated_operation_ids == []
+
+
+@pytest.mark.parametrize("interrupted_suffix", [HASH_SIDECAR_SUFFIX, OPERATION_HASHES_SUFFIX])
+def test_interrupted_cache_update_is_not_reported_unchanged(tmp_path, monkeypatch, interrupted_suffix):
+    """
+    Test that the previous spec is still diffed against a cache whose update stopped after the spec was written.
+    """
+    previous_spec_dict = swagger_spec_test_data[0][1]
+    new_spec_dict = swagger_spec_test_data[0][0]
+    cache_swagger(previous_spec_dict, tmp_path)
+
+    atomic_write = swagger._atomic_write
+
+    def interrupted_atomic_write(file_path, data):
+        if str(file_path).endswith(interrupted_suffix):
+            raise OSError("interrupted")
+        atomic_write(file_path, data)
+
+    monkeypatch.setattr(swagger, "_atomic_write", interrupted_atomic_write)
+    with pytest.raises(OSError):
+        cache_swagger(new_spec_dict, tmp_path)
+
+    # Act
+    updated_operation_ids = get_updated_operationIDs_from_cache(previous_spec_dict, os.path.join(tmp_path, "swagger_cache.json"))
+
+    # Assert
+    assert updated_operation_ids == ["getTest"]
@@ -0,0 +1,124 @@
+import pytest
+import copy
+
+from ..utils.swagger import resolve_refs
+
+
+def test_resolves_local_refs():
+    """
+    Test that local references are replaced by the nodes they point to.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "responses": {
+                        "400": {"description": "Error", "schema": {"$ref": "#/definitions/Error"}}
+                    }
+                }
+            }
+        },
+        "definitions": {
+            "Error": {"type": "object", "properties": {"code": {"type": "integer"}}}
+        }
+    }
+
+    # Act
+    resolved = resolve_refs(swagger_spec_dict)
+
+    # Assert
+    assert resolved["paths"]["/test"]["get"]["responses"]["400"]["schema"] == swagger_spec_dict["definitions"]["Error"]
+
+
+def test_shares_resolved_nodes_and_does_not_modify_spec():
+    """
+    Test that a reference used in several places is resolved once and shared, leaving the input untouched.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "responses": {
+                        "400": {"description": "Bad request", "schema": {"$ref": "#/definitions/Error"}},
+                        "404": {"description": "Not found", "schema": {"$ref": "#/definitions/Error"}}
+                    }
+                }
+            }
+        },
+        "definitions": {
+            "Error": {"type": "object", "properties": {"code": {"type": "integer"}}}
+        }
+    }
+    original = copy.deepcopy(swagger_spec_dict)
+
+    # Act
+    resolved = resolve_refs(swagger_spec_dict)
+
+    # Assert
+    responses = resolved["paths"]["/test"]["get"]["responses"]
+    assert responses["400"]["schema"] is responses["404"]["schema"]
+    assert swagger_spec_dict == original
+
+
+def test_leaves_recursive_refs_unresolved():
+    """
+    Test that a recursive reference is kept as a '$ref' where the recursion starts.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "responses": {
+                        "200": {"description": "Tree", "schema": {"$ref": "#/definitions/Node"}}
+                    }
+                }
+            }
+        },
+        "definitions": {
+            "Node": {"type": "object", "properties": {"child": {"$ref": "#/definitions/Node"}}}
+        }
+    }
+
+    # Act
+    resolved = resolve_refs(swagger_spec_dict)
+
+    # Assert
+    schema = resolved["paths"]["/test"]["get"]["responses"]["200"]["schema"]
+    assert schema == {"type": "object", "properties": {"child": {"$ref": "#/definitions/Node"}}}
+
+
+def test_only_resolves_refs_reached_from_paths():
+    """
+    Test that the sections outside of the paths are kept as they are, without being resolved.
+    """
+    # Arrange
+    swagger_spec_dict = {
+        "paths": {
+            "/test": {
+                "get": {
+                    "operationId": "getTest",
+                    "responses": {
+                        "400": {"description": "Error", "schema": {"$ref": "#/definitions/Error"}}
+                    }
+                }
+            }
+        },
+        "definitions": {
+            "Error": {"type": "object", "properties": {"code": {"$ref": "#/definitions/Code"}}},
+            "Code": {"type": "integer"},
+            "Unused": {"type": "object", "properties": {"code": {"$ref": "#/definitions/Code"}}}
+        }
+    }
+
+    # Act
+    resolved = resolve_refs(swagger_spec_dict)
+
+    # Assert
+    assert resolved["paths"]["/test"]["get"]["responses"]["400"]["schema"]["properties"]["code"] == {"type": "integer"}
+    assert resolved["definitions"] is swagger_spec_dict["definitions"]
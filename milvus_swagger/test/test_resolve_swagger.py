@@ -0,0 +1,114 @@
+import pytest
+import io
+import json
+
+from ..utils import swagger
+from ..utils.swagger import resolve_swagger
+
+
+swagger_spec_dict = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Test API",
+        "version": "1.0"
+    },
+    "paths": {
+        "/test": {
+            "get": {
+                "operationId": "getTest",
+                "responses": {
+                    "200": {"$ref": "#/responses/Ok"}
+                }
+            }
+        }
+    },
+    "responses": {
+        "Ok": {"description": "OK"}
+    }
+}
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status_code: int = 200, headers: dict = None):
+        self.raw = io.BytesIO(body)
+        self.raw.read = lambda decode_content=False, read=self.raw.read: read()
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = body.decode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeSession:
+    def __init__(self, status_code: int = 200, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.fetched_urls = []
+
+    def get(self, url, **kwargs):
+        self.fetched_urls.append(url)
+        return FakeResponse(json.dumps(swagger_spec_dict).encode(), self.status_code, self.headers)
+
+
+@pytest.fixture
+def fake_session(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(swagger, "_RESOLVED_SWAGGERS", {})
+    session = FakeSession(headers={"ETag": '"v1"'})
+    monkeypatch.setattr(swagger, "_SESSION", session)
+    return session
+
+
+def test_swagger_is_fetched_once(fake_session):
+    """
+    Test that the spec is fetched only once, and the same document is validated and resolved.
+    """
+    # Act
+    resolved = resolve_swagger("http://localhost/swagger.json")
+
+    # Assert
+    assert fake_session.fetched_urls == ["http://localhost/swagger.json"]
+    assert resolved["paths"]["/test"]["get"]["responses"]["200"] == {"description": "OK"}
+
+
+def test_unchanged_etag_returns_memoized_swagger(fake_session, monkeypatch):
+    """
+    Test that a spec served again with the same ETag is not resolved again.
+    """
+    resolved = resolve_swagger("http://localhost/swagger.json")
+    monkeypatch.setattr(swagger, "resolve_refs", lambda spec: pytest.fail("spec resolved again"))
+
+    # Act
+    resolved_again = resolve_swagger("http://localhost/swagger.json")
+
+    # Assert
+    assert resolved_again is resolved
+
+
+def test_changed_etag_resolves_swagger_again(fake_session):
+    """
+    Test that a spec served with a new ETag is resolved again.
+    """
+    resolved = resolve_swagger("http://localhost/swagger.json")
+    fake_session.headers = {"ETag": '"v2"'}
+
+    # Act
+    resolved_again = resolve_swagger("http://localhost/swagger.json")
+
+    # Assert
+    assert resolved_again is not resolved
+    assert resolved_again == resolved
+
+
+def test_raises_when_swagger_cannot_be_fetched(fake_session):
+    """
+    Test that a ValueError is raised when the spec cannot be retrieved.
+    """
+    fake_session.status_code = 404
+
+    with pytest.raises(ValueError):
+        resolve_swagger("http://localhost/swagger.json")
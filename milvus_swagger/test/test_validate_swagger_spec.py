@@ -0,0 +1,149 @@
+import pytest
+import json
+
+from ..utils import swagger
+from ..utils.swagger import validate_swagger_spec
+
+
+valid_swagger_spec_dict = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Test API",
+        "version": "1.0"
+    },
+    "paths": {
+        "/test": {
+            "get": {
+                "operationId": "getTest",
+                "responses": {
+                    "200": {"description": "OK"}
+                }
+            }
+        }
+    }
+}
+
+
+def test_valid_spec_is_remembered(tmp_path):
+    """
+    Test that a valid spec passes validation and its digest is written to the validated hashes file.
+    """
+    validated_hashes_file = tmp_path / "validated_hashes.json"
+
+    # Act
+    result = validate_swagger_spec(valid_swagger_spec_dict, str(validated_hashes_file))
+
+    # Assert
+    assert result == True
+    with open(validated_hashes_file, 'r') as f:
+        assert len(json.load(f)) == 1
+
+
+def test_invalid_spec_is_not_remembered(tmp_path):
+    """
+    Test that an invalid spec fails validation and nothing is written to the validated hashes file.
+    """
+    validated_hashes_file = tmp_path / "validated_hashes.json"
+
+    # Act
+    result = validate_swagger_spec({"swagger": "2.0", "paths": {}}, str(validated_hashes_file))
+
+    # Assert
+    assert result == False
+    assert not validated_hashes_file.exists()
+
+
+def test_remembered_spec_skips_validation(tmp_path, monkeypatch):
+    """
+    Test that a spec whose digest was remembered is not validated again.
+    """
+    validated_hashes_file = tmp_path / "validated_hashes.json"
+    validate_swagger_spec(valid_swagger_spec_dict, str(validated_hashes_file))
+
+    def fail_validation(*args, **kwargs):
+        raise AssertionError("validation should have been skipped")
+
+    monkeypatch.setattr(swagger, "_OpenAPIV2SpecValidator", fail_validation)
+
+    # Act
+    result = validate_swagger_spec(valid_swagger_spec_dict, str(validated_hashes_file))
+
+    # Assert
+    assert result == True
+
+
+def test_schema_is_not_compiled_per_validation(tmp_path, monkeypatch):
+    """
+    Test that validating specs reuses the meta-schema compiled at import instead of compiling it again.
+    """
+    def fail_compilation(*args, **kwargs):
+        raise AssertionError("the meta-schema should not be compiled again")
+
+    monkeypatch.setattr(swagger.jsonschema_rs, "Draft4Validator", fail_compilation)
+
+    # Act
+    valid = validate_swagger_spec(valid_swagger_spec_dict, str(tmp_path / "validated_hashes.json"))
+    invalid = validate_swagger_spec({"swagger": "2.0", "paths": {}}, str(tmp_path / "validated_hashes.json"))
+
+    # Assert
+    assert valid == True
+    assert invalid == False
+
+
+def test_unreadable_hashes_file_is_ignored_and_rewritten(tmp_path):
+    """
+    Test that a truncated validated hashes file doesn't break validation, and is replaced by a valid one.
+    """
+    validated_hashes_file = tmp_path / "validated_hashes.json"
+    validated_hashes_file.write_text('["abc", "de')
+
+    # Act
+    result = validate_swagger_spec(valid_swagger_spec_dict, str(validated_hashes_file))
+
+    # Assert
+    assert result == True
+    with open(validated_hashes_file, 'r') as f:
+        assert len(json.load(f)) == 1
+
+
+def test_only_the_latest_hashes_are_remembered(tmp_path, monkeypatch):
+    """
+    Test that the validated hashes file keeps only the most recent VALIDATED_HASHES_MAX digests.
+    """
+    monkeypatch.setattr(swagger, "VALIDATED_HASHES_MAX", 2)
+    validated_hashes_file = tmp_path / "validated_hashes.json"
+
+    # Act
+    for version in ["1.0", "2.0", "3.0"]:
+        spec = {**valid_swagger_spec_dict, "info": {"title": "Test API", "version": version}}
+        assert validate_swagger_spec(spec, str(validated_hashes_file)) == True
+
+    # Assert
+    with open(validated_hashes_file, 'r') as f:
+        validated_hashes = json.load(f)
+
+    assert validated_hashes == [
+        swagger._json_digest({**valid_swagger_spec_dict, "info": {"title": "Test API", "version": version}})
+        for version in ["2.0", "3.0"]
+    ]
+
+
+def test_formats_are_not_checked(tmp_path):
+    """
+    Test that values not matching their 'format' are accepted, as openapi-spec-validator does.
+    """
+    spec = {
+        **valid_swagger_spec_dict,
+        "info": {
+            "title": "Test API",
+            "version": "1.0",
+            "contact": {"url": "www.example.com", "email": "not-an-email"},
+            "license": {"name": "License", "url": "/license"}
+        }
+    }
+
+    # Act
+    result = validate_swagger_spec(spec, str(tmp_path / "validated_hashes.json"))
+
+    # Assert
+    assert result == True
@@ -9,14 +9,41 @@ from langchain_ollama.embeddings import OllamaEmbeddings
 from pymilvus import Collection, MilvusException, connections, db, utility
 from rich import print
 from rich.progress import Progress
+import asyncio
+import functools
 import uuid
 import hashlib
 import os
 import datetime
-import json
+import orjson
 
 URI = "http://localhost:19530"
 
+# Number of endpoints summarized, embedded and inserted into Milvus together
+BATCH_SIZE = 64
+# Number of batches processed at the same time
+MAX_CONCURRENT_BATCHES = 8
+# Number of concurrent LLM calls used to summarize a single batch
+SUMMARY_MAX_CONCURRENCY = 4
+
+# Endpoints tagged with this are not ingested
+SKIPPED_TAG = "Dynamic-Entity"
+
+# Text embedded for each endpoint
+ENDPOINT_DESCRIPTION_TEMPLATE = """{method} {path} - {operation_id}
+
+description: {description}
+
+tags: {tags}
+
+    parameters: {parameters}
+
+    responses: {responses}
+"""
+
+# Many endpoint descriptions share the same HTML, so convert each distinct one only once
+cached_markdownify = functools.lru_cache(maxsize=4096)(markdownify)
+
 def seutp_milvus_vectorstore(embeddings: List[Embeddings], db_name: str, uri: Optional[str] = None) -> Milvus:
 
     if uri is None:
@@ -51,25 +78,111 @@ def seutp_milvus_vectorstore(embeddings: List[Embeddings], db_name: str, uri: Op
     return vectorstore
     
 
-def ingest_swagger(
+
+def _build_endpoint_document(path: str, method: str, properties: dict, summarized_description: str) -> Document:
+    """
+    Converts a single swagger endpoint into a Document ready to be added to the vectorstore.
+    Args:
+        path (str): The path of the endpoint
+        method (str): The HTTP method of the endpoint
+        properties (dict): The swagger properties of the endpoint
+        summarized_description (str): The (optionally summarized) description of the endpoint
+    Returns:
+        Document: The Document for the endpoint, with a deterministic UUID derived from its OperationID
+    """
+    operation_id = properties['operationId']
+
+    # Generate deterministic UUID from OperationID
+    endpoint_uuid = uuid.UUID(bytes=hashlib.blake2b(operation_id.encode('utf-8'), digest_size=16).digest())
+
+    # Only keep the fields needed in Milvus, with list properties converted to strings
+    tags = str(properties.get('tags', []))
+    parameters = str(properties.get('parameters', []))
+    responses = properties.get('responses', {})
+
+    method = method.upper()
+
+    endpoint_metadata = {
+        'method': method,
+        'path': path,
+        'operationId': operation_id,
+        'summary': properties.get('summary', ''),
+        # Change the description from HTML to markdown format
+        'description': cached_markdownify(properties['description']),
+        'tags': tags,
+        'parameters': parameters,
+        'responses': responses,
+        'security': str(properties.get('security', [])),
+    }
+
+    endpoint_description_string = ENDPOINT_DESCRIPTION_TEMPLATE.format(
+        method=method,
+        path=path,
+        operation_id=operation_id,
+        description=summarized_description,
+        tags=tags,
+        parameters=parameters,
+        responses=responses,
+    )
+
+    return Document(
+        id=str(endpoint_uuid),
+        page_content=endpoint_description_string,
+        metadata=endpoint_metadata,
+    )
+
+async def _aadd_documents(milvus_vectorstore: Milvus, docs: List[Document]):
+    """
+    Adds documents to the Milvus vectorstore, embedding them with all of its embedding models concurrently.
+    Milvus.add_documents would call each embedding model one after the other.
+    Args:
+        milvus_vectorstore (Milvus): The vectorstore to add the documents to
+        docs (List[Document]): The documents to add, with their ids set
+    """
+    texts = [doc.page_content for doc in docs]
+
+    embedding_models = milvus_vectorstore.embeddings
+    if not isinstance(embedding_models, list):
+        embedding_models = [embedding_models]
+
+    vectors_per_model = await asyncio.gather(*[model.aembed_documents(texts) for model in embedding_models])
+
+    # add_embeddings expects one vector per text, or one list of vectors per text with several models
+    if len(embedding_models) > 1:
+        embeddings = [list(text_vectors) for text_vectors in zip(*vectors_per_model)]
+    else:
+        embeddings = vectors_per_model[0]
+
+    await asyncio.to_thread(
+        milvus_vectorstore.add_embeddings,
+        texts=texts,
+        embeddings=embeddings,
+        metadatas=[doc.metadata for doc in docs],
+        ids=[doc.id for doc in docs],
+    )
+
+
+async def aingest_swagger(
         swagger_spec: dict, 
         milvus_vectorstore: Milvus, 
         endpoint_summary_chain: Optional[Runnable] = None,
-        checkpoint_file: str = "swagger_ingestion_progress.json",
-        log_file: str = "swagger_ingestion_log.json",
+        checkpoint_file: str = "swagger_ingestion_progress.jsonl",
+        log_file: str = "swagger_ingestion_log.jsonl",
         resume: bool = False,
         ) -> List[Document]:
     """
-    Ingests the swagger specification into the Milvus vectorstore.
+    Asynchronously ingests the swagger specification into the Milvus vectorstore.
+    Endpoints are processed in batches of BATCH_SIZE, with up to MAX_CONCURRENT_BATCHES batches
+    being summarized, embedded and inserted at the same time.
     This function processes each endpoint from the swagger specification,
     converts the endpoint details into Document objects, and adds them to the Milvus vectorstore.
-    It skips endpoints with 'Dynamic-Entity' tags, summarizes descriptions when a chain is provided,
-    and generates deterministic UUIDs for each endpoint.
+    It skips endpoints with 'Dynamic-Entity' tags (SKIPPED_TAG) before doing any work on them,
+    summarizes descriptions when a chain is provided, and generates deterministic UUIDs for each endpoint.
     Args:
         swagger_spec (dict): The swagger specification as a dictionary
         db_namespace (uuid.UUID): The namespace UUID used for generating deterministic UUIDs
         endpoint_summary_chain (Optional[Runnable]): An optional chain for summarizing endpoint descriptions
-        checkpoint_file (str): Path to checkpoint file to save/resume progress
+        checkpoint_file (str): Path to the append-only JSON Lines checkpoint file to save/resume progress
         resume (bool): Whether to resume from previous checkpoint
     Returns:
         List[Document]: A list of Document objects created from the swagger spec endpoints
@@ -77,116 +190,106 @@ def ingest_swagger(
     
     # Load processed endpoints from checkpoint file if it exists and resume is enabled
     processed_endpoints = {}
+    checkpoint_ends_with_newline = True
     if resume and os.path.exists(checkpoint_file):
         try:
-            with open(checkpoint_file, 'r') as f:
-                processed_endpoints = json.load(f)
+            with open(checkpoint_file, 'rb') as f:
+                # Each line records one processed endpoint
+                for line in f:
+                    try:
+                        processed_endpoints.update(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # A line can be left incomplete if ingestion was interrupted mid-write
+                        print(f"Skipping malformed checkpoint line: {line!r}")
+                    checkpoint_ends_with_newline = line.endswith(b"\n")
             print(f"Resuming from checkpoint with {len(processed_endpoints)} previously processed endpoints")
         except Exception as e:
             print(f"Error loading checkpoint file: {e}")
 
-    # Count endpoints to be processed
-    total_endpoints_count = 0
-    for path, endpoint in swagger_spec["paths"].items():
-        for method, properties in endpoint.items():
-            # Skip already processed endpoints if resuming
-            endpoint_key = f"{method}:{path}"
-            if resume and endpoint_key in processed_endpoints:
-                continue
-            total_endpoints_count += 1
-
-    documents = []
-    endpoints_processed = 0
-    with Progress() as progress:
-        # this context manager is just for the progress bar
-        task = progress.add_task("[cyan]Ingesting swagger spec into Milvus vectorstore...", total=total_endpoints_count)
-
-        for path, endpoint in swagger_spec["paths"].items():
-            for method, properties in endpoint.items():
-                
-                # Create a unique key for this endpoint
-                endpoint_key = f"{method}:{path}"
-
-                # Skip if already processed and resuming
-                if resume and endpoint_key in processed_endpoints:
-                    continue
-                
-                    
+    # Collect the endpoints to be processed in a single pass, its length is reused for the progress bar.
+    # processed_endpoints is only filled when resuming, so already processed endpoints are skipped then.
+    # Endpoints with a skipped tag are left out here so they never reach summarization or embedding.
+    pending = [
+        (endpoint_key, path, method, properties)
+        for path, endpoint in swagger_spec["paths"].items()
+        for method, properties in endpoint.items()
+        if (endpoint_key := f"{method}:{path}") not in processed_endpoints
+        and SKIPPED_TAG not in properties.get('tags', [])
+    ]
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    checkpoint_lock = asyncio.Lock()
+    first_insert_lock = asyncio.Lock()
+    first_insert_done = False
+
+    async def add_batch_documents(batch_docs: List[Document]):
+        """Inserts the documents of a batch, the first insert being done alone since it creates the collection."""
+        nonlocal first_insert_done
+        if not first_insert_done:
+            async with first_insert_lock:
+                if not first_insert_done:
+                    await _aadd_documents(milvus_vectorstore, batch_docs)
+                    first_insert_done = True
+                    return
+        await _aadd_documents(milvus_vectorstore, batch_docs)
+
+    async def ingest_batch(batch: list) -> List[Document]:
+        """Summarizes, embeds and inserts one batch of endpoints, then records them in the checkpoint."""
+        async with semaphore:
+            # Summarize the descriptions of the whole batch in one batched call
+            if endpoint_summary_chain is not None:
                 try:
-                    
-                    props = properties.copy()
-                    
-                    # Summarize the description of the endpoint in markdown
-                    if endpoint_summary_chain is not None:
-                        summary_chain_response = endpoint_summary_chain.invoke({"raw_description": properties['description']})
-                        summarized_description = summary_chain_response.content
-                    else:
-                        summarized_description = properties['description']
-                    
-
-                    # Change the description from HTML to markdown format
-                    props['description'] = markdownify(props['description'])
-                    
-                    # Generate deterministic UUID from OperationID
-                    m = hashlib.md5()
-                    m.update(props['operationId'].encode('utf-8'))
-                    endpoint_uuid = uuid.UUID(m.hexdigest())
-
-                    # Convert non-string properties to strings
-                    for field in ['tags', 'parameters', 'security']:
-                        if field in props and isinstance(props[field], list):
-                            props[field] = str(props[field])
-
-
-                    endpoint_metadata = {'method': method.upper(),'path': path,} | props
-
-                    endpoint_description_string = f"""
-                    {method.upper()} {path} - {props['operationId']}
-
-                    description: {summarized_description}
-
-                    tags: {props['tags']}
+                    summary_chain_responses = await endpoint_summary_chain.abatch(
+                        [{"raw_description": properties['description']} for _, _, _, properties in batch],
+                        config={"max_concurrency": SUMMARY_MAX_CONCURRENCY},
+                    )
+                except Exception as e:
+                    print(f"Error summarizing {len(batch)} endpoints: {e}")
+                    raise
+                summarized_descriptions = [response.content for response in summary_chain_responses]
+            else:
+                summarized_descriptions = [properties['description'] for _, _, _, properties in batch]
 
-                        parameters: {props['parameters']}
+            batch_docs = []
+            for (endpoint_key, path, method, properties), summarized_description in zip(batch, summarized_descriptions):
+                try:
+                    batch_docs.append(_build_endpoint_document(path, method, properties, summarized_description))
+                except Exception as e:
+                    print(f"Error processing {method.upper()} {path}: {e}")
+                    raise
 
-                        responses: {props['responses']}
-                    """
+            try:
+                await add_batch_documents(batch_docs)
+            except Exception as e:
+                print(f"Error adding {len(batch_docs)} documents to the vectorstore: {e}")
+                raise
 
-                    doc = Document(
-                        id=endpoint_uuid,
-                        page_content=endpoint_description_string,
-                        metadata=endpoint_metadata,
+            # Append the processed endpoints to the checkpoint after successful processing
+            async with checkpoint_lock:
+                processed_at = str(datetime.datetime.now())
+                for (endpoint_key, _, _, _), doc in zip(batch, batch_docs):
+                    checkpoint_fp.write(orjson.dumps({endpoint_key: {"uuid": doc.id, "processed_at": processed_at}}) + b"\n")
+                    print(f"{doc.metadata['method']} {doc.metadata['path']} processed...")
+                checkpoint_fp.flush()
 
-                    )
+            progress.update(task, advance=len(batch_docs)) # update the progress bar
 
-                    milvus_vectorstore.add_documents([doc], ids=[doc.id])
-                    documents.append(doc)
+            return batch_docs
 
-                    # Update checkpoint after successful processing
-                    processed_endpoints[endpoint_key] = {
-                        "uuid": str(endpoint_uuid),
-                        "processed_at": str(datetime.datetime.now()),
-                    }
-
-                    # Save checkpoint periodically (e.g., every 10 endpoints)
-                    if len(processed_endpoints) % 5 == 0:
-                        with open(checkpoint_file, 'w+') as f:
-                            json.dump(processed_endpoints, f)
-    
-                    print(f"{method.upper()} {path} processed...")
+    # Keep appending to the checkpoint when resuming, otherwise start a fresh one
+    with open(checkpoint_file, 'ab' if resume else 'wb') as checkpoint_fp, Progress() as progress:
+        # this context manager is just for the progress bar
+        task = progress.add_task("[cyan]Ingesting swagger spec into Milvus vectorstore...", total=len(pending))
 
-                except Exception as e:
-                    print(f"Error processing {method.upper()} {path}: {e}")
-                    # Save checkpoint on error to enable resuming
-                    with open(checkpoint_file, 'w+') as f:
-                        json.dump(processed_endpoints, f)
-                    raise
+        # Make sure new records don't get appended to an incomplete last line
+        if not checkpoint_ends_with_newline:
+            checkpoint_fp.write(b"\n")
 
-                progress.update(task, advance=1) # update the progress bar
+        batches_docs = await asyncio.gather(
+            *[ingest_batch(pending[i:i + BATCH_SIZE]) for i in range(0, len(pending), BATCH_SIZE)]
+        )
 
-        # Final checkpoint save
-        with open(checkpoint_file, 'w') as f:
-            json.dump(processed_endpoints, f)
+        documents = [doc for batch_docs in batches_docs for doc in batch_docs]
 
     # At the end of the function, after successful completion:
     print("Completed ingesting swagger spec into Milvus vectorstore.")
@@ -206,4 +309,13 @@ def ingest_swagger(
         except Exception as e:
             print(f"Warning: Couldn't rename checkpoint file to log: {e}")
 
-    return documents
\ No newline at end of file
+    return documents
+
+
+def ingest_swagger(*args, **kwargs) -> List[Document]:
+    """
+    Synchronous wrapper around aingest_swagger, taking the same arguments.
+    Returns:
+        List[Document]: A list of Document objects created from the swagger spec endpoints
+    """
+    return asyncio.run(aingest_swagger(*args, **kwargs))
@@ -1,19 +1,41 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables.base import Runnable
 from dotenv import load_dotenv
 
+import functools
 import os
 
-# Load environment variables from .env file
-load_dotenv("../.env")
-
-if not os.getenv("OPENAI_API_KEY"):
-    raise ValueError("OPENAI_API_KEY environment variable not set. Please set it in your environment variables or .env file.")
-
 # Define an endpoint to summarize the descriptions
 prompt = ChatPromptTemplate.from_template(
     "Summarise the following OpenAPI endpoint description (written in html) in plain text with less than 2000 characters:\n\n{raw_description}"
 )
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
-endpoint_summary_chain = prompt | llm
\ No newline at end of file
+
+@functools.lru_cache(maxsize=1)
+def get_endpoint_summary_chain() -> Runnable:
+    """
+    Builds the chain summarizing endpoint descriptions on first use, and returns the same chain afterwards.
+    Nothing is loaded or checked at import time, so code paths that don't summarize don't need an OpenAI API key.
+    Returns:
+        Runnable: The prompt | llm chain taking a "raw_description" input
+    Raises:
+        ValueError: If the OPENAI_API_KEY environment variable is not set
+    """
+    from langchain_openai import ChatOpenAI
+
+    # Load environment variables from .env file
+    load_dotenv("../.env")
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise ValueError("OPENAI_API_KEY environment variable not set. Please set it in your environment variables or .env file.")
+
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+    return prompt | llm
+
+
+def __getattr__(name: str):
+    # Keep `from .summarizer import endpoint_summary_chain` working, building the chain lazily
+    if name == "endpoint_summary_chain":
+        return get_endpoint_summary_chain()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
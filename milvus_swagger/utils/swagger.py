@@ -1,39 +1,163 @@
 import os
+import hashlib
+import logging
+import concurrent.futures
 import requests
-import json
+import orjson
+import jsonschema_rs
+
+from cachecontrol import CacheControlAdapter
+from cachecontrol.caches.file_cache import FileCache
+from urllib3.util.retry import Retry
+
+from jsonschema.exceptions import ValidationError
+from openapi_spec_validator import OpenAPIV2SpecValidator
+from openapi_spec_validator.schemas import schema_v2
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the file storing the digest of a cached specification, next to the cached file
+HASH_SIDECAR_SUFFIX = ".b2hash"
+
+# Suffix replacing the extension of a cached specification for the file storing the digests of its operations
+OPERATION_HASHES_SUFFIX = ".hashes.json"
+
+# File remembering the digests of the specifications that passed validation
+VALIDATED_HASHES_FILE = os.path.join(".cache", "validated_hashes.json")
+# Number of digests remembered in that file, the oldest ones being forgotten first
+VALIDATED_HASHES_MAX = 256
+
+# Directory where HTTP responses are cached, so unchanged specs are revalidated with conditional requests
+HTTP_CACHE_DIR = os.path.join(".cache", "http")
+
+# Maximum number of connections kept open per host, and of concurrent fetches
+HTTP_POOL_MAXSIZE = 8
+
+# Shared session so connections are reused across fetches, retrying transient failures with backoff,
+# and honouring the ETag / Last-Modified / Cache-Control headers of the servers
+_SESSION = requests.Session()
+_ADAPTER = CacheControlAdapter(
+    cache=FileCache(HTTP_CACHE_DIR),
+    pool_connections=4,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# Last resolved specification of each URL, along with the ETag it was served with
+_RESOLVED_SWAGGERS: dict[str, tuple[str, dict]] = {}
+
+class _CompiledSchemaValidator:
+    """
+    Validates instances against a JSON schema compiled once with jsonschema-rs,
+    yielding jsonschema ValidationErrors so that openapi-spec-validator can report them as usual.
+    """
+    def __init__(self, schema: dict):
+        # Like the jsonschema validator of openapi-spec-validator, 'format' keywords are not checked
+        self._validator = jsonschema_rs.Draft4Validator(schema, validate_formats=False)
+
+    def iter_errors(self, instance):
+        # jsonschema-rs collects every error before iter_errors yields the first one, while validate
+        # stops at the first error: the complete list is only collected if more errors are asked for
+        try:
+            self._validator.validate(instance)
+            return
+        except jsonschema_rs.ValidationError as error:
+            first_error = error
+        yield self._to_validation_error(first_error)
+
+        for error in self._validator.iter_errors(instance):
+            if (error.instance_path, error.schema_path, error.message) != (first_error.instance_path, first_error.schema_path, first_error.message):
+                yield self._to_validation_error(error)
+
+    @staticmethod
+    def _to_validation_error(error) -> ValidationError:
+        return ValidationError(
+            error.message,
+            path=error.instance_path,
+            schema_path=error.schema_path,
+            instance=error.instance,
+        )
+
+
+class _OpenAPIV2SpecValidator(OpenAPIV2SpecValidator):
+    """
+    OpenAPIV2SpecValidator checking the Swagger 2.0 schema with the compiled validator,
+    which is much faster than the pure Python one on large specs. The other checks of
+    openapi-spec-validator (operationIds, path parameters, defaults...) are unchanged.
+    The meta-schema is compiled once, when this module is imported, and shared by every validation.
+    """
+    schema_validator = _CompiledSchemaValidator(dict(schema_v2))
+
+
+def _request_swagger(url: str):
+    """
+    Sends the GET request for a Swagger/OpenAPI specification over the shared session.
+    Returns the streamed response if successful, or None after logging why the request failed.
+    """
+    logger.info("Fetching swagger from %s", url)
+    try:
+        response = _SESSION.get(url, headers={"Accept-Encoding": "gzip"}, stream=True)
+    except requests.exceptions.RequestException as e:
+        logger.error("Failed to get swagger from %s: %s", url, e)
+        return None
+
+    if response.status_code != 200:
+        with response:
+            logger.error(
+                "Failed to get swagger from %s\nResponse status code: %s\nResponse text: %s",
+                url, response.status_code, response.text,
+            )
+        return None
+
+    return response
+
+
+def _read_swagger(response) -> dict:
+    # Read the (decompressed) body in one go and parse the bytes directly,
+    # without requests assembling .content chunk by chunk or decoding it to a str first
+    return orjson.loads(response.raw.read(decode_content=True))
 
-from openapi_spec_validator import OpenAPIV2SpecValidator, validate
-from prance import ResolvingParser
 
 def get_swagger(url: str): 
     """
     Retrieve a Swagger/OpenAPI specification from a given URL.
-    This function makes an HTTP GET request to the specified URL, expecting to
-    receive a Swagger/OpenAPI JSON document in response. If the request fails
-    or returns a non-200 status code, detailed error information is printed to
-    the console.
+    This function makes an HTTP GET request to the specified URL, over a shared
+    connection-pooled session, expecting to receive a Swagger/OpenAPI JSON
+    document in response. If the request fails or returns a non-200 status
+    code, detailed error information is logged.
     Args:
         url (str): The URL from which to retrieve the Swagger specification.
     Returns:
         dict: The parsed Swagger specification as a Python dictionary if successful,
               or None if the request fails or returns a non-200 status code.
     Raises:
-        No exceptions are raised as they are caught and printed internally.
+        No exceptions are raised as they are caught and logged internally.
     """
-    print(f"Fetching swagger from {url}")
-    try:
-        response = requests.get(url)
-    except requests.exceptions.RequestException as e:
-        print(e)
-        return None
-    
-    if response.status_code != 200:
-        print(f"Failed to get swagger from {url}")
-        print(f"Response status code: {response.status_code}")
-        print(f"Response text: {response.text}")
+    response = _request_swagger(url)
+    if response is None:
         return None
-    
-    return response.json()
+
+    with response:
+        return _read_swagger(response)
+
+def get_swaggers(urls: list[str]):
+    """
+    Retrieve several Swagger/OpenAPI specifications concurrently, one thread per request
+    up to the connection pool size of the shared session, so the total time is close to
+    the slowest fetch rather than the sum of them.
+    Args:
+        urls (list[str]): The URLs from which to retrieve the Swagger specifications.
+    Returns:
+        list: The parsed Swagger specifications in the same order as the URLs,
+              with None for each one that could not be retrieved (see get_swagger).
+    """
+    if not urls:
+        return []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(HTTP_POOL_MAXSIZE, len(urls))) as executor:
+        return list(executor.map(get_swagger, urls))
 
 def validate_swagger(url: str):
     """
@@ -53,41 +177,249 @@ def validate_swagger(url: str):
     if swagger is None:
         raise ValueError("Failed to get swagger from the specified URL.")
 
+    return validate_swagger_spec(swagger)
+
+
+def validate_swagger_spec(swagger: dict, validated_hashes_file: str = VALIDATED_HASHES_FILE):
+    """
+    This function validates an already retrieved Swagger specification.
+    The digests of the last VALIDATED_HASHES_MAX valid specifications are remembered in a file,
+    so validating an unchanged specification again only costs hashing it.
+    The file is only a cache: if it can't be read, every specification is validated again.
+
+    Parameters:
+        swagger (dict): The Swagger specification to validate.
+        validated_hashes_file (str): The file remembering the digests of valid specifications.
+
+    Returns:
+        bool: True if the Swagger specification is valid, False otherwise.
+    """
+    digest = _json_digest(swagger)
+
+    # Insertion ordered set of the digests, from the oldest to the most recently validated
+    validated_hashes: dict[str, None] = {}
     try:
-        validate(swagger, cls=OpenAPIV2SpecValidator)
+        with open(validated_hashes_file, 'rb') as f:
+            validated_hashes = dict.fromkeys(orjson.loads(f.read()))
+    except FileNotFoundError:
+        pass
+    except (OSError, TypeError, orjson.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable validated hashes file %s: %s", validated_hashes_file, e)
+
+    if digest in validated_hashes:
+        logger.debug("Swagger was already validated, skipping validation.")
         return True
+
+    # Only the first error is needed to reject the specification, the remaining ones are never looked for
+    try:
+        error = next(_OpenAPIV2SpecValidator(swagger).iter_errors(), None)
     except Exception as e:
-        print("Swagger validation failed.")
-        print(e)
+        error = e
+    if error is not None:
+        logger.warning("Swagger validation failed.\n%s", error)
         return False
 
+    validated_hashes[digest] = None
+    os.makedirs(os.path.dirname(validated_hashes_file) or ".", exist_ok=True)
+    _atomic_write(validated_hashes_file, orjson.dumps(list(validated_hashes)[-VALIDATED_HASHES_MAX:]))
+
+    return True
+
+
+def _lookup_ref(swagger: dict, ref: str):
+    """
+    Returns the node of a Swagger specification pointed to by a local JSON reference such as '#/definitions/Error'.
+    """
+    node = swagger
+    for part in ref[2:].split('/'):
+        part = part.replace('~1', '/').replace('~0', '~')
+        node = node[int(part)] if isinstance(node, list) else node[part]
+    return node
+
+
+def resolve_refs(swagger: dict) -> dict:
+    """
+    This function replaces the local '$ref's in the paths of a Swagger specification with the nodes they point to.
+    Only the references reached from the paths are resolved, when they are first met: the other sections
+    (definitions, parameters, responses...) are kept as they are, sharing the nodes of the given specification.
+    Each reference is resolved only once, and the resolved node is shared by every place referring to it
+    instead of being copied. Recursive references are left as '$ref's where the recursion starts.
+
+    Parameters:
+        swagger (dict): The Swagger specification to resolve, it is not modified.
 
-def recursion_handler(recursion_limit, parsed_url, refs):
-    print(recursion_limit, parsed_url, refs)
-    return {'$ref': '#'+parsed_url.fragment}
+    Returns:
+        dict: The resolved Swagger specification.
+    """
+    resolved_refs = {}
+    resolving = []
+
+    def resolve(node):
+        # Returns the resolved node, and the set of references it had to leave unresolved
+        # because they were still being resolved further up
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str) and ref.startswith('#/'):
+                if ref in resolved_refs:
+                    return resolved_refs[ref], set()
+                if ref in resolving:
+                    return {'$ref': ref}, {ref}
+
+                resolving.append(ref)
+                resolved, cut_refs = resolve(_lookup_ref(swagger, ref))
+                resolving.pop()
+
+                cut_refs.discard(ref)
+                # Only reuse the result when it doesn't depend on where the reference was reached from
+                if not cut_refs:
+                    resolved_refs[ref] = resolved
+                return resolved, cut_refs
+
+            resolved, cut_refs = {}, set()
+            for key, value in node.items():
+                resolved[key], value_cut_refs = resolve(value)
+                cut_refs |= value_cut_refs
+            return resolved, cut_refs
+
+        if isinstance(node, list):
+            resolved, cut_refs = [], set()
+            for value in node:
+                resolved_value, value_cut_refs = resolve(value)
+                resolved.append(resolved_value)
+                cut_refs |= value_cut_refs
+            return resolved, cut_refs
+
+        return node, set()
+
+    resolved_swagger = dict(swagger)
+    if 'paths' in swagger:
+        resolved_swagger['paths'] = resolve(swagger['paths'])[0]
+    return resolved_swagger
 
 
 def resolve_swagger(url: str):
+    """
+    This function retrieves, validates and resolves the references of a Swagger specification.
+    The specification is fetched only once, and the same document is handed to both the
+    validator and the resolver.
+    When the server sends an ETag, the resolved specification is kept in memory, and returned
+    again without parsing, validating or resolving anything as long as the ETag doesn't change.
+    The returned dictionary is then shared between calls, and should not be modified.
+
+    Parameters:
+        url (str): The URL from which to retrieve the Swagger specification.
+
+    Returns:
+        dict: The resolved Swagger specification, or None if it is invalid or cannot be resolved.
+
+    Raises:
+        ValueError: If the Swagger specification cannot be retrieved.
+    """
+    response = _request_swagger(url)
+
+    if response is None:
+        raise ValueError("Failed to get swagger from the specified URL.")
 
-    if validate_swagger(url):
-        print("Swagger is valid, resolving...")
+    with response:
+        etag = response.headers.get("ETag")
+        if etag and url in _RESOLVED_SWAGGERS and _RESOLVED_SWAGGERS[url][0] == etag:
+            logger.debug("Swagger unchanged since it was last resolved.")
+            return _RESOLVED_SWAGGERS[url][1]
+
+        swagger = _read_swagger(response)
+
+    if validate_swagger_spec(swagger):
+        logger.debug("Swagger is valid, resolving...")
         try:
-            parser = ResolvingParser(url, recursion_limit_handler=recursion_handler)
+            swagger_dict = resolve_refs(swagger)
         except Exception as e:
-            print("Error resolving swagger:", e)
+            logger.error("Error resolving swagger: %s", e)
             return None
-        swagger_dict = parser.specification
-        print("Swagger resolved successfully.")
+        logger.info("Swagger resolved successfully.")
+        if etag:
+            _RESOLVED_SWAGGERS[url] = (etag, swagger_dict)
         return swagger_dict
     
     else:
-        print("Swagger is not valid, cannot resolve.")
+        logger.error("Swagger is not valid, cannot resolve.")
         return None
     
 
+def _json_digest(obj) -> str:
+    """
+    Returns the BLAKE2b hex digest of the canonical (key sorted) JSON serialization of an object,
+    such as a Swagger specification or one of its operations.
+    """
+    return hashlib.blake2b(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _operation_digests(swagger_spec_dict: dict) -> dict:
+    """
+    Maps the (path, method) of every operation in a Swagger specification to its operationId and the digest of its properties.
+    Operations without an operationId are left out.
+    """
+    return {
+        (path, method): (operationID, _json_digest(properties))
+        for path, methods in swagger_spec_dict.get("paths", {}).items()
+        for method, properties in methods.items()
+        if (operationID := properties.get("operationId"))
+    }
+
+
+def _atomic_write(file_path: str, data: bytes):
+    """
+    Writes data to a file through a temporary file replacing it at once,
+    so an interrupted write never leaves a truncated file behind.
+    """
+    tmp_file_path = f"{file_path}.tmp"
+    with open(tmp_file_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file_path, file_path)
+
+
+def _read_hash_sidecar(cached_spec_path):
+    """
+    Returns the digest stored in the sidecar of a cached specification, or None if it has no sidecar.
+    """
+    try:
+        with open(f"{cached_spec_path}{HASH_SIDECAR_SUFFIX}", 'r') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _operation_hashes_path(cached_spec_path) -> str:
+    """
+    Returns the path of the file storing the operation digests of a cached specification.
+    """
+    return os.path.splitext(cached_spec_path)[0] + OPERATION_HASHES_SUFFIX
+
+
+def _load_cached_operation_digests(cached_spec_path) -> dict:
+    """
+    Returns the operation digests of a cached specification, from the file written by cache_swagger
+    when it exists, or by loading and hashing the cached specification otherwise.
+    """
+    operation_hashes_path = _operation_hashes_path(cached_spec_path)
+    if os.path.exists(operation_hashes_path):
+        with open(operation_hashes_path, 'rb') as f:
+            return {
+                (path, method): (operationID, digest)
+                for path, method, operationID, digest in orjson.loads(f.read())
+            }
+
+    with open(cached_spec_path, 'rb') as f:
+        return _operation_digests(orjson.loads(f.read()))
+
+
 def cache_swagger(swagger_spec_dict: dict, cache_dir: str = ".cache/"):
     """
-    This function caches a Swagger specification to a local file.
+    This function caches a Swagger specification to a local file,
+    along with a sidecar file holding the digest of the specification and
+    a file holding the digest of each of its operations.
+    The files are written atomically. The digest files of the previous specification are removed
+    before the new one is written, and the sidecar is written last: if the process stops in between,
+    the missing digest files only make the next checks compare against the cached file itself.
 
     Parameters:
         swagger_dict (dict): The Swagger specification to cache.
@@ -96,13 +428,23 @@ def cache_swagger(swagger_spec_dict: dict, cache_dir: str = ".cache/"):
     Returns:
         str: The path to the cached file.
     """
-    if not os.path.exists(cache_dir):
-        os.makedirs(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
 
     cache_file = os.path.join(cache_dir, "swagger_cache.json")
-    
-    with open(cache_file, 'w') as f:
-        json.dump(swagger_spec_dict, f)
+
+    # Stale digests must never be trusted for the new cached file
+    for digest_file in (cache_file + HASH_SIDECAR_SUFFIX, _operation_hashes_path(cache_file)):
+        try:
+            os.remove(digest_file)
+        except FileNotFoundError:
+            pass
+
+    _atomic_write(cache_file, orjson.dumps(swagger_spec_dict))
+    _atomic_write(_operation_hashes_path(cache_file), orjson.dumps([
+        [path, method, operationID, digest]
+        for (path, method), (operationID, digest) in _operation_digests(swagger_spec_dict).items()
+    ]))
+    _atomic_write(cache_file + HASH_SIDECAR_SUFFIX, _json_digest(swagger_spec_dict).encode())
 
     return cache_file
 
@@ -110,6 +452,8 @@ def cache_swagger(swagger_spec_dict: dict, cache_dir: str = ".cache/"):
 def check_against_cache(swagger_spec_dict: dict, cached_spec_path: str):
     """
     This function checks if a cached Swagger specification matches the given one.
+    When the digest sidecar written by cache_swagger is present, only the digests are compared
+    and the cached file is not loaded at all.
 
     Parameters:
         swagger_dict (dict): The Swagger specification to check.
@@ -121,16 +465,27 @@ def check_against_cache(swagger_spec_dict: dict, cached_spec_path: str):
     if not os.path.exists(cached_spec_path):
         raise ValueError(f"Cached spec file not found at {cached_spec_path}")
 
-    with open(cached_spec_path, 'r') as f:
-        cached_spec = json.load(f)
+    cached_digest = _read_hash_sidecar(cached_spec_path)
+    if cached_digest is not None:
+        return cached_digest == _json_digest(swagger_spec_dict)
+
+    # Caches written without a sidecar are compared in full
+    with open(cached_spec_path, 'rb') as f:
+        cached_spec = orjson.loads(f.read())
 
     return swagger_spec_dict == cached_spec
 
 
-def get_updated_operationIDs_from_cache(swagger_spec_dict: dict, cached_spec_path: str):
+def get_updated_operationIDs_from_cache(swagger_spec_dict: dict, cached_spec_path: str) -> list[str]:
     """
     This function compares a Swagger specification with a cached version and returns the operation IDs that need to be updated.
-    It checks each path and method in the Swagger specification against the cached specification,
+    Both specifications are flattened once into operations keyed by (path, method), and compared
+    in a single pass over the incoming operations, checking digests of the operation properties.
+    Cached operations are consumed as they are matched, so the ones left over are the removed ones.
+    The digests of the cached operations are read from the file written by cache_swagger when present,
+    so the cached specification itself is not loaded.
+    When the digest sidecar of the cached specification matches the whole given specification,
+    nothing changed and no operation is looked at.
 
     Parameters:
         swagger_dict (dict): The Swagger specification to compare.
@@ -142,59 +497,34 @@ def get_updated_operationIDs_from_cache(swagger_spec_dict: dict, cached_spec_pat
     if not os.path.exists(cached_spec_path):
         raise ValueError(f"Cached spec file not found at {cached_spec_path}")
 
-    with open(cached_spec_path, 'r') as f:
-        cached_spec = json.load(f)
-
-    updated_operationIDs = []
-    for path, methods in swagger_spec_dict["paths"].items():
-
-        # If path does not exist, all methods are new
-        if path not in cached_spec["paths"]:
-            for method, properties in methods.items():
-                operationID = properties.get("operationId")
-                if operationID:
-                    updated_operationIDs.append(operationID)
-
-        else:
-            # If path exists, check each method
-            for method, properties in methods.items():
-                operationID = properties.get("operationId")
-                # If method does not exist, it's a new method
-                if method not in cached_spec["paths"][path]:
-                    if operationID:
-                        updated_operationIDs.append(operationID)
-                    continue
-
-                if properties != cached_spec["paths"][path][method]:
-                    # If properties are different, check operationId
-                    if operationID and operationID not in updated_operationIDs:
-                        updated_operationIDs.append(operationID)
-
-    print("Updated operation IDs after checking incoming spec:", updated_operationIDs)
-
-    # Check for removed operation IDs
-    for path, methods in cached_spec["paths"].items():
-        # If path does not exist, all methods are removed
-        if path not in swagger_spec_dict["paths"]:
-            for method, properties in methods.items():
-                operationID = properties.get("operationId")
-                if operationID and operationID not in updated_operationIDs:
-                    updated_operationIDs.append(operationID)
-        else:
-            # If path exists, check each method
-            for method, properties in methods.items():
-                operationID = properties.get("operationId")
-                # If method does not exist, it's a removed method
-                if method not in swagger_spec_dict["paths"][path]:
-                    if operationID and operationID not in updated_operationIDs:
-                        updated_operationIDs.append(operationID)
-                else:
-                    # If properties are different, check operationId
-                    if properties != swagger_spec_dict["paths"][path][method]:
-                        if operationID and operationID not in updated_operationIDs:
-                            updated_operationIDs.append(operationID)
-                    
-
-    print("Updated operation IDs after checking deletions:", updated_operationIDs)
-
-    return updated_operationIDs
\ No newline at end of file
+    cached_digest = _read_hash_sidecar(cached_spec_path)
+    if cached_digest is not None and cached_digest == _json_digest(swagger_spec_dict):
+        logger.debug("Swagger unchanged since it was cached, no operation IDs to update.")
+        return []
+
+    current_operations = _operation_digests(swagger_spec_dict)
+    cached_operations = _load_cached_operation_digests(cached_spec_path)
+
+    # Insertion ordered set of the operation IDs: adding is idempotent and O(1) like a set,
+    # but the output keeps a stable order between runs
+    updated_operationIDs: dict[str, None] = {}
+
+    # Operations that are new, or whose properties changed
+    for key, (operationID, digest) in current_operations.items():
+        cached_operation = cached_operations.pop(key, None)
+        if cached_operation == (operationID, digest):
+            continue
+        updated_operationIDs[operationID] = None
+        # A renamed operation also has to replace the one stored under its previous ID
+        if cached_operation is not None:
+            updated_operationIDs[cached_operation[0]] = None
+
+    logger.debug("Updated operation IDs after checking incoming spec: %s", list(updated_operationIDs))
+
+    # Operations that were removed, the only cached ones not matched above
+    for operationID, _ in cached_operations.values():
+        updated_operationIDs[operationID] = None
+
+    logger.debug("Updated operation IDs after checking deletions: %s", list(updated_operationIDs))
+
+    return list(updated_operationIDs)